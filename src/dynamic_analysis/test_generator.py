@@ -6,9 +6,36 @@ whether a code repair has fixed the identified issues.
 """
 from typing import List, Dict, Any, Optional
 import ast
+from functools import cached_property, lru_cache
 from pathlib import Path
 
 
+# Each entry holds a file's bytes and its tree, and every rewrite of a file
+# adds a new one; a run only analyses a handful of files, so keep the bound small
+_PARSE_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_cached(path: str, source: bytes) -> ast.Module:
+    """
+    Parse Python source, memoized on its path and exact content.
+    
+    Keying on the content itself rather than on file metadata means any
+    rewrite of the file is re-parsed, even one that keeps the same size
+    within a single mtime tick. The returned tree is shared between callers
+    and must not be mutated.
+    
+    Args:
+        path: Path the source was read from, used in error messages
+        source: Raw bytes of the source file
+        
+    Returns:
+        Parsed module tree
+    """
+    # ast.parse() accepts bytes and honours any coding declaration itself
+    return ast.parse(source, filename=path)
+
+
 class TestGenerator:
     """Test case generator for code repair validation."""
     
@@ -22,20 +49,41 @@ class TestGenerator:
         """
         self.source_file = Path(source_file)
         self.error_info = error_info
-        self.ast_tree = None
+        
+    @cached_property
+    def ast_tree(self) -> ast.Module:
+        """
+        AST of the source file, parsed on first access and reused afterwards.
+        
+        Unlike the former plain attribute, which was None until parse_source()
+        ran, accessing ast_tree reads and parses the file and can raise; use
+        parse_source() to get a bool instead of an exception.
+        
+        Generators for the same path and content share one parsed tree, so
+        the tree must be treated as read-only: run NodeTransformer,
+        fix_missing_locations or any other in-place change on a
+        copy.deepcopy() of it instead.
+        
+        Returns:
+            Parsed module tree
+            
+        Raises:
+            OSError: If the source file cannot be read, e.g. FileNotFoundError
+            SyntaxError: If the source file cannot be parsed
+        """
+        return _parse_cached(str(self.source_file), self.source_file.read_bytes())
         
     def parse_source(self) -> bool:
         """
         Parse the source file into an AST for analysis.
         
+        The tree is cached on ast_tree, so repeated calls do not re-parse.
+        
         Returns:
             bool: True if parsing succeeded, False otherwise
         """
         try:
-            with open(self.source_file, 'r') as f:
-                source = f.read()
-            self.ast_tree = ast.parse(source)
-            return True
+            return self.ast_tree is not None
         except Exception as e:
             print(f"Error parsing source: {e}")
             return False
@@ -5,10 +5,87 @@ This module integrates with LLMs to generate code repairs based on static and dy
 analysis results.
 """
 from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import functools
+import hashlib
 import os
+import re
 import json
+import threading
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional accelerator; fall back to the stdlib encoder
+    orjson = None
+
+# Non-string keys are stringified as the stdlib does; types the stdlib cannot
+# encode natively are passed through so that _dumps hands them to the stdlib
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_PASSTHROUGH_SUBCLASS
+) if orjson is not None else 0
+
+
+# Placeholders recognised in prompt templates
+_PLACEHOLDER_RE = re.compile(r"\{\{(SOURCE_CODE|ERROR_INFO|TEST_RESULTS)\}\}")
+
+# Maximum number of LLM responses each CodeRepairManager keeps cached
+_REPAIR_CACHE_SIZE = 512
+
+# Loaded templates shared by all CodeRepairPrompt instances:
+# directory -> (file signature, templates)
+_TEMPLATE_CACHE: Dict[str, Tuple[Tuple, Dict[str, str]]] = {}
+
+
+@functools.lru_cache(maxsize=64)
+def _split_template(template: str) -> Tuple[str, ...]:
+    """
+    Split a prompt template around its placeholders.
+    
+    Memoized on the template text, so each distinct template is scanned once.
+    
+    Args:
+        template: Template text
+        
+    Returns:
+        Tuple alternating literal text and placeholder names, starting and
+        ending with literal text
+    """
+    return tuple(_PLACEHOLDER_RE.split(template))
+
+
+def _dumps(obj: Any) -> str:
+    """
+    Serialize analysis data for embedding in a prompt.
+    
+    Uses compact separators: indentation carries no information for the LLM
+    but adds input tokens. orjson is used when installed, as it encodes
+    several times faster than the stdlib json module. Dates, dataclasses and
+    subclasses of built-in types are passed through rather than converted by
+    orjson, so they and any other value it rejects, such as integers beyond
+    64 bits, are encoded by the stdlib instead, which raises TypeError for
+    what it cannot encode either. The two encoders still differ in float
+    formatting: orjson writes 1e20 and 1e-7 where the stdlib writes 1e+20
+    and 1e-07, and orjson writes NaN and infinities as null. orjson also
+    encodes UUID and Enum values, which the stdlib rejects.
+    
+    Args:
+        obj: JSON-serializable object
+        
+    Returns:
+        Compact JSON string
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
 
 class CodeRepairPrompt:
     """Class for generating prompts for LLM-based code repair."""
@@ -25,15 +102,34 @@ class CodeRepairPrompt:
         self._load_templates()
         
     def _load_templates(self):
-        """Load prompt templates from the template directory."""
-        if not self.template_dir.exists():
+        """
+        Load prompt templates from the template directory.
+        
+        Templates are cached per directory for the lifetime of the process and
+        only re-read when a template file is added, removed or modified.
+        """
+        if not self.template_dir.is_dir():
             print(f"Warning: Template directory {self.template_dir} does not exist")
             return
             
-        for template_file in self.template_dir.glob("*.txt"):
-            template_name = template_file.stem
-            with open(template_file, 'r') as f:
-                self.templates[template_name] = f.read()
+        with os.scandir(self.template_dir) as it:
+            entries = [e for e in it if e.name.endswith(".txt") and e.is_file()]
+        signature = tuple(sorted(
+            (e.name, e.stat().st_mtime_ns, e.stat().st_size) for e in entries
+        ))
+        
+        cache_key = str(self.template_dir.resolve())
+        cached = _TEMPLATE_CACHE.get(cache_key)
+        if cached is None or cached[0] != signature:
+            templates = {}
+            for entry in entries:
+                template_name = Path(entry.name).stem
+                templates[template_name] = Path(entry.path).read_text(encoding="utf-8")
+            cached = (signature, templates)
+            _TEMPLATE_CACHE[cache_key] = cached
+            
+        # Copy so that changes to one instance's templates do not leak into the cache
+        self.templates = dict(cached[1])
     
     def generate_repair_prompt(self, error_info: Dict[str, Any], 
                               source_code: str, 
@@ -50,39 +146,33 @@ class CodeRepairPrompt:
             Formatted prompt string to send to the LLM
         """
         if "repair" not in self.templates:
-            # Fallback template if no templates are loaded
-            prompt = (
-                "Please fix the following code:\n\n"
-                f"{source_code}\n\n"
-                "The static analysis tool found these errors:\n"
-                f"{json.dumps(error_info, indent=2)}\n\n"
-            )
-            
+            # Fallback template if no templates are loaded; pieces are joined once
+            # so the source code is not copied again for every appended section
+            parts = [
+                "Please fix the following code:\n\n",
+                source_code,
+                "\n\nThe static analysis tool found these errors:\n",
+                _dumps(error_info),
+                "\n\n",
+            ]
+
             if test_results:
-                prompt += (
-                    "Test results:\n"
-                    f"{json.dumps(test_results, indent=2)}\n\n"
-                )
-                
-            prompt += "Please provide the corrected code."
-            return prompt
+                parts.extend(["Test results:\n", _dumps(test_results), "\n\n"])
+
+            parts.append("Please provide the corrected code.")
+            return "".join(parts)
             
         # Use the template if available
-        prompt = self.templates["repair"]
+        values = {
+            "SOURCE_CODE": source_code,
+            "ERROR_INFO": _dumps(error_info),
+            "TEST_RESULTS": _dumps(test_results) if test_results else "No test results available",
+        }
         
-        # Replace placeholders in the template
-        prompt = prompt.replace("{{SOURCE_CODE}}", source_code)
-        prompt = prompt.replace("{{ERROR_INFO}}", json.dumps(error_info, indent=2))
-        
-        if test_results:
-            prompt = prompt.replace(
-                "{{TEST_RESULTS}}", 
-                json.dumps(test_results, indent=2)
-            )
-        else:
-            prompt = prompt.replace("{{TEST_RESULTS}}", "No test results available")
-            
-        return prompt
+        # Filling the split template is a single join; substituted text is never
+        # scanned, so placeholders inside the source code are left alone
+        parts = _split_template(self.templates["repair"])
+        return "".join(values[part] if i % 2 else part for i, part in enumerate(parts))
 
 
 class CodeRepairManager:
@@ -99,6 +189,12 @@ class CodeRepairManager:
         self.llm_api_key = llm_api_key
         self.prompt_generator = prompt_generator
         self.repair_history = []
+        # LRU cache of LLM responses keyed by a digest of the prompt, and a lock
+        # per digest currently being requested so that concurrent identical
+        # prompts share one LLM call; _cache_guard protects both dicts
+        self._repair_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._cache_guard = threading.Lock()
         
     def repair_code(self, source_file: str, 
                    error_info: Dict[str, Any],
@@ -106,6 +202,9 @@ class CodeRepairManager:
         """
         Repair code using LLM suggestions based on error information.
         
+        If neither error information nor test results are given, the LLM is not
+        consulted and the source is returned unchanged.
+        
         Args:
             source_file: Path to the source file to repair
             error_info: Dictionary containing error information from static analysis
@@ -117,14 +216,18 @@ class CodeRepairManager:
         with open(source_file, 'r') as f:
             source_code = f.read()
             
-        prompt = self.prompt_generator.generate_repair_prompt(
-            error_info, source_code, test_results
-        )
-        
-        # TODO: Integrate with actual LLM API
-        # This is a placeholder for the actual LLM API call
-        repaired_code = self._get_llm_repair(prompt)
-        confidence_score = 0.8  # Placeholder confidence score
+        if not error_info and not test_results:
+            # Nothing was reported against this file, so there is nothing for the
+            # LLM to repair; return the source unchanged without a round trip
+            repaired_code = source_code
+            confidence_score = 1.0
+        else:
+            prompt = self.prompt_generator.generate_repair_prompt(
+                error_info, source_code, test_results
+            )
+            
+            repaired_code = self._cached_llm_repair(prompt)
+            confidence_score = 0.8  # Placeholder confidence score
         
         # Record the repair in history
         self.repair_history.append({
@@ -137,6 +240,109 @@ class CodeRepairManager:
         
         return repaired_code, confidence_score
         
+    def _cached_llm_repair(self, prompt: str) -> str:
+        """
+        Get code repair from LLM, reusing the answer for a previously seen prompt.
+        
+        An identical prompt (same template, source, errors and test results) gets
+        the same answer, so the LLM is asked once per distinct prompt. Concurrent
+        duplicates wait for the first request instead of racing it.
+        
+        Args:
+            prompt: Prompt to send to the LLM
+            
+        Returns:
+            Repaired code from LLM
+        """
+        cache_key = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+        
+        with self._cache_guard:
+            repaired_code = self._cache_get(cache_key)
+            if repaired_code is not None:
+                return repaired_code
+            key_lock = self._key_locks.setdefault(cache_key, threading.Lock())
+            
+        with key_lock:
+            # A concurrent duplicate may have filled the entry while we waited
+            with self._cache_guard:
+                repaired_code = self._cache_get(cache_key)
+            if repaired_code is not None:
+                return repaired_code
+                
+            try:
+                # TODO: Integrate with actual LLM API
+                # This is a placeholder for the actual LLM API call
+                repaired_code = self._get_llm_repair(prompt)
+                with self._cache_guard:
+                    self._repair_cache[cache_key] = repaired_code
+                    if len(self._repair_cache) > _REPAIR_CACHE_SIZE:
+                        self._repair_cache.popitem(last=False)
+            finally:
+                # The entry is filled or the call failed; either way the lock is no
+                # longer needed unless a later request has already replaced it
+                with self._cache_guard:
+                    if self._key_locks.get(cache_key) is key_lock:
+                        del self._key_locks[cache_key]
+                        
+        return repaired_code
+        
+    def _cache_get(self, cache_key: str) -> Optional[str]:
+        """
+        Look up a cached repair and mark it as recently used.
+        
+        Must be called with _cache_guard held.
+        
+        Args:
+            cache_key: Digest of the prompt
+            
+        Returns:
+            Cached repaired code, or None if not cached
+        """
+        repaired_code = self._repair_cache.get(cache_key)
+        if repaired_code is not None:
+            self._repair_cache.move_to_end(cache_key)
+        return repaired_code
+        
+    async def repair_many(self, repairs: List[Tuple[Any, ...]],
+                          max_concurrent: int = 5) -> List[Any]:
+        """
+        Repair several source files concurrently.
+        
+        Each repair runs in a worker thread so that waiting on the LLM does not
+        block the event loop; at most max_concurrent repairs are in flight at once.
+        
+        Args:
+            repairs: List of (source_file, error_info) or
+                     (source_file, error_info, test_results) tuples
+            max_concurrent: Maximum number of concurrent repairs, at least 1
+            
+        Returns:
+            List of (repaired_code, confidence_score) tuples in input order; a repair
+            that raised is represented by its exception instead
+            
+        Raises:
+            ValueError: If max_concurrent is less than 1
+        """
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+            
+        sem = asyncio.Semaphore(max_concurrent)
+        loop = asyncio.get_running_loop()
+        
+        async def _repair_one(source_file: str, error_info: Dict[str, Any],
+                              test_results: Optional[Dict[str, Any]] = None
+                              ) -> Tuple[str, float]:
+            async with sem:
+                return await loop.run_in_executor(
+                    None,
+                    functools.partial(self.repair_code, source_file, error_info, test_results)
+                )
+        
+        return await asyncio.gather(
+            *[_repair_one(*repair) for repair in repairs],
+            return_exceptions=True
+        )
+        
     def _get_llm_repair(self, prompt: str) -> str:
         """
         Get code repair from LLM.
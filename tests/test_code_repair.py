@@ -0,0 +1,306 @@
+"""
+Unit tests for the LLM code repair module.
+
+The LLM call is stubbed out, so these tests exercise prompt generation, response
+caching, duplicate suppression and concurrent repair without network access.
+"""
+import asyncio
+import datetime
+import json
+import threading
+import time
+
+import pytest
+
+from src.llm import code_repair
+from src.llm.code_repair import CodeRepairManager, CodeRepairPrompt
+
+
+class StubRepairManager(CodeRepairManager):
+    """CodeRepairManager whose LLM call echoes the prompt and records each call."""
+
+    def __init__(self, prompt_generator: CodeRepairPrompt, delay: float = 0.0,
+                 fail_times: int = 0):
+        super().__init__("test-key", prompt_generator)
+        self.delay = delay
+        self.fail_times = fail_times
+        self.prompts = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._stats_lock = threading.Lock()
+
+    def _get_llm_repair(self, prompt: str) -> str:
+        with self._stats_lock:
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            should_fail = len(self.prompts) <= self.fail_times
+        try:
+            time.sleep(self.delay)
+            if should_fail:
+                raise RuntimeError("LLM unavailable")
+            return f"fixed<{prompt}>"
+        finally:
+            with self._stats_lock:
+                self.in_flight -= 1
+
+
+class OverlappingRepairManager(StubRepairManager):
+    """Stub whose first LLM call waits until a second request has started."""
+
+    def __init__(self, prompt_generator: CodeRepairPrompt):
+        super().__init__(prompt_generator)
+        self.entered = 0
+        self.second_entered = threading.Event()
+
+    def _cached_llm_repair(self, prompt: str) -> str:
+        with self._stats_lock:
+            self.entered += 1
+            if self.entered == 2:
+                self.second_entered.set()
+        return super()._cached_llm_repair(prompt)
+
+    def _get_llm_repair(self, prompt: str) -> str:
+        self.second_entered.wait(timeout=2)
+        # Give the second request time to reach its cache lookup
+        time.sleep(0.05)
+        return super()._get_llm_repair(prompt)
+
+@pytest.fixture
+def prompt_generator(tmp_path):
+    """Prompt generator with a minimal template so prompts are easy to predict."""
+    template_dir = tmp_path / "templates"
+    template_dir.mkdir()
+    (template_dir / "repair.txt").write_text(
+        "{{SOURCE_CODE}}|{{ERROR_INFO}}|{{TEST_RESULTS}}", encoding="utf-8"
+    )
+    return CodeRepairPrompt(str(template_dir))
+
+
+@pytest.fixture
+def make_source(tmp_path):
+    """Factory writing a C++ source file and returning its path."""
+    def _make(name: str, content: str = "int main() { return 0; }\n") -> str:
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+    return _make
+
+
+def expected_repair(source: str, error_info, test_results=None) -> str:
+    """Repair the stub returns for the minimal template."""
+    tests = json.dumps(test_results, separators=(",", ":")) if test_results \
+        else "No test results available"
+    return f"fixed<{source}|{json.dumps(error_info, separators=(',', ':'))}|{tests}>"
+
+
+def test_template_placeholders_in_source_are_not_substituted(prompt_generator):
+    prompt = prompt_generator.generate_repair_prompt({"a": 1}, "// {{ERROR_INFO}}")
+    assert prompt == '// {{ERROR_INFO}}|{"a":1}|No test results available'
+
+
+def test_template_set_through_templates_dict_is_used(tmp_path, prompt_generator):
+    missing = CodeRepairPrompt(str(tmp_path / "missing"))
+    missing.templates["repair"] = "Fix {{SOURCE_CODE}}"
+    assert missing.generate_repair_prompt({}, "x") == "Fix x"
+
+    prompt_generator.templates["repair"] = "Override {{SOURCE_CODE}}"
+    assert prompt_generator.generate_repair_prompt({}, "y") == "Override y"
+
+
+def test_templates_are_reloaded_when_a_file_changes(tmp_path):
+    template_dir = tmp_path / "templates"
+    template_dir.mkdir()
+    repair = template_dir / "repair.txt"
+    repair.write_text("v1 {{SOURCE_CODE}}", encoding="utf-8")
+    assert CodeRepairPrompt(str(template_dir)).templates == {"repair": "v1 {{SOURCE_CODE}}"}
+
+    repair.write_text("version 2 {{SOURCE_CODE}}", encoding="utf-8")
+    (template_dir / "review.txt").write_text("Review", encoding="utf-8")
+    assert CodeRepairPrompt(str(template_dir)).templates == {
+        "repair": "version 2 {{SOURCE_CODE}}", "review": "Review"
+    }
+
+    repair.unlink()
+    assert CodeRepairPrompt(str(template_dir)).templates == {"review": "Review"}
+
+
+def test_template_dir_that_is_a_file_falls_back(tmp_path):
+    not_a_dir = tmp_path / "templates"
+    not_a_dir.write_text("", encoding="utf-8")
+
+    prompt_generator = CodeRepairPrompt(str(not_a_dir))
+
+    assert prompt_generator.templates == {}
+    assert prompt_generator.generate_repair_prompt({}, "x").startswith("Please fix")
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Run a _dumps test with orjson, when installed, and with the stdlib alone."""
+    if request.param == "json":
+        monkeypatch.setattr(code_repair, "orjson", None)
+    elif code_repair.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_dumps_encodes_integers_beyond_64_bits(encoder):
+    encoded = code_repair._dumps({"n": 2**70, 1: "é"})
+    assert encoded == '{"n":1180591620717411303424,"1":"é"}'
+
+
+def test_dumps_rejects_dates_with_either_encoder(encoder):
+    with pytest.raises(TypeError):
+        code_repair._dumps({"when": datetime.date(2024, 1, 1)})
+
+
+def test_repair_code_reuses_cached_response(prompt_generator, make_source):
+    manager = StubRepairManager(prompt_generator)
+    source = make_source("a.cpp")
+
+    first = manager.repair_code(source, {"bug": "NULL_DEREFERENCE"})
+    second = manager.repair_code(source, {"bug": "NULL_DEREFERENCE"})
+
+    assert first == second
+    assert len(manager.prompts) == 1
+    assert len(manager.repair_history) == 2
+
+
+def test_repair_code_cache_misses_when_error_info_changes(prompt_generator, make_source):
+    manager = StubRepairManager(prompt_generator)
+    source = make_source("a.cpp")
+
+    manager.repair_code(source, {"bug": "NULL_DEREFERENCE"})
+    repaired, _ = manager.repair_code(source, {"bug": "MEMORY_LEAK"})
+
+    assert len(manager.prompts) == 2
+    assert repaired == expected_repair(
+        "int main() { return 0; }\n", {"bug": "MEMORY_LEAK"}
+    )
+
+
+def test_repair_code_cache_is_bounded(prompt_generator, make_source, monkeypatch):
+    monkeypatch.setattr(code_repair, "_REPAIR_CACHE_SIZE", 2)
+    manager = StubRepairManager(prompt_generator)
+    source = make_source("a.cpp")
+
+    for i in range(3):
+        manager.repair_code(source, {"id": i})
+    # {"id": 0} was evicted as least recently used, {"id": 2} is still cached
+    manager.repair_code(source, {"id": 2})
+    manager.repair_code(source, {"id": 0})
+
+    assert len(manager.prompts) == 4
+    assert len(manager._repair_cache) == 2
+    assert manager._key_locks == {}
+
+
+def test_failed_llm_call_is_not_cached(prompt_generator, make_source):
+    manager = StubRepairManager(prompt_generator, fail_times=1)
+    source = make_source("a.cpp")
+
+    with pytest.raises(RuntimeError):
+        manager.repair_code(source, {"bug": "MEMORY_LEAK"})
+    repaired, _ = manager.repair_code(source, {"bug": "MEMORY_LEAK"})
+
+    assert len(manager.prompts) == 2
+    assert repaired.startswith("fixed<")
+    assert manager._key_locks == {}
+
+
+def test_repair_code_skips_llm_when_nothing_reported(prompt_generator, make_source):
+    manager = StubRepairManager(prompt_generator)
+    source = make_source("clean.cpp", "int x = 0;\n")
+
+    repaired, confidence = manager.repair_code(source, {})
+
+    assert (repaired, confidence) == ("int x = 0;\n", 1.0)
+    assert manager.prompts == []
+    assert manager.repair_history[-1]["repaired_code"] == "int x = 0;\n"
+
+
+def test_repair_many_returns_results_in_input_order(prompt_generator, make_source):
+    manager = StubRepairManager(prompt_generator, delay=0.01)
+    sources = [make_source(f"f{i}.cpp", f"int f{i}();\n") for i in range(4)]
+
+    results = asyncio.run(manager.repair_many(
+        [(source, {"id": i}) for i, source in enumerate(sources)]
+    ))
+
+    assert results == [
+        (expected_repair(f"int f{i}();\n", {"id": i}), 0.8) for i in range(4)
+    ]
+
+
+def test_repair_many_accepts_test_results(prompt_generator, make_source):
+    manager = StubRepairManager(prompt_generator)
+    source = make_source("a.cpp")
+
+    results = asyncio.run(manager.repair_many(
+        [(source, {"id": 1}, {"total_tests": 2, "passed_tests": 1})]
+    ))
+
+    assert results == [(expected_repair(
+        "int main() { return 0; }\n", {"id": 1}, {"total_tests": 2, "passed_tests": 1}
+    ), 0.8)]
+
+
+def test_repair_many_shares_one_call_for_identical_prompts(prompt_generator, make_source):
+    manager = StubRepairManager(prompt_generator, delay=0.05)
+    copy_a = make_source("a.cpp", "int dup;\n")
+    copy_b = make_source("b.cpp", "int dup;\n")
+    other = make_source("c.cpp", "int other;\n")
+
+    results = asyncio.run(manager.repair_many(
+        [(copy_a, {"id": 1}), (copy_b, {"id": 1}), (other, {"id": 1})]
+    ))
+
+    assert len(manager.prompts) == 2
+    assert results[0] == results[1] == (expected_repair("int dup;\n", {"id": 1}), 0.8)
+    assert results[2] == (expected_repair("int other;\n", {"id": 1}), 0.8)
+    assert len(manager.repair_history) == 3
+    assert manager._key_locks == {}
+
+
+def test_concurrent_duplicate_waits_for_the_first_call(prompt_generator, make_source):
+    manager = OverlappingRepairManager(prompt_generator)
+    copy_a = make_source("a.cpp", "int dup;\n")
+    copy_b = make_source("b.cpp", "int dup;\n")
+
+    results = asyncio.run(manager.repair_many(
+        [(copy_a, {"id": 1}), (copy_b, {"id": 1})], max_concurrent=2
+    ))
+
+    # The duplicate entered while the first call was still in flight
+    assert manager.second_entered.is_set()
+    assert len(manager.prompts) == 1
+    assert results[0] == results[1] == (expected_repair("int dup;\n", {"id": 1}), 0.8)
+
+def test_repair_many_limits_concurrency(prompt_generator, make_source):
+    manager = StubRepairManager(prompt_generator, delay=0.02)
+    repairs = [(make_source(f"f{i}.cpp", f"int f{i};\n"), {"id": i}) for i in range(6)]
+
+    asyncio.run(manager.repair_many(repairs, max_concurrent=2))
+
+    assert len(manager.prompts) == 6
+    assert manager.peak_in_flight == 2
+
+
+def test_repair_many_reports_failures_per_item(prompt_generator, make_source, tmp_path):
+    manager = StubRepairManager(prompt_generator)
+    source = make_source("a.cpp")
+
+    results = asyncio.run(manager.repair_many(
+        [(str(tmp_path / "missing.cpp"), {"id": 1}), (source, {"id": 2})]
+    ))
+
+    assert isinstance(results[0], FileNotFoundError)
+    assert results[1] == (expected_repair("int main() { return 0; }\n", {"id": 2}), 0.8)
+
+
+@pytest.mark.parametrize("max_concurrent", [0, -1])
+def test_repair_many_rejects_non_positive_concurrency(prompt_generator, max_concurrent):
+    manager = StubRepairManager(prompt_generator)
+
+    with pytest.raises(ValueError):
+        asyncio.run(manager.repair_many([], max_concurrent=max_concurrent))
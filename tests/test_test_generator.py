@@ -0,0 +1,80 @@
+"""
+Unit tests for the test generator module.
+
+These tests exercise parsing of the source file and the shared parse cache.
+"""
+import ast
+import os
+
+import pytest
+
+from src.dynamic_analysis import test_generator
+
+
+@pytest.fixture
+def make_source(tmp_path):
+    """Factory writing a Python source file and returning its path."""
+    def _make(name: str, content: str = "x = 1\n") -> str:
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+    return _make
+
+
+def assigned_name(tree: ast.Module) -> str:
+    """Name bound by the single assignment in a parsed module."""
+    return tree.body[0].targets[0].id
+
+
+def test_ast_tree_is_shared_for_same_path_and_content(make_source):
+    source = make_source("a.py")
+
+    first = test_generator.TestGenerator(source, {})
+    second = test_generator.TestGenerator(source, {})
+
+    assert first.ast_tree is second.ast_tree
+    assert first.ast_tree is first.ast_tree
+
+
+def test_ast_tree_is_not_shared_across_paths(make_source):
+    first = test_generator.TestGenerator(make_source("a.py"), {})
+    second = test_generator.TestGenerator(make_source("b.py"), {})
+
+    assert first.ast_tree is not second.ast_tree
+
+
+def test_ast_tree_reparses_same_size_rewrite(make_source):
+    source = make_source("a.py", "x = 1\n")
+    before = test_generator.TestGenerator(source, {}).ast_tree
+    stat = os.stat(source)
+
+    # Same size and the old mtime restored, so only the content differs
+    with open(source, "w", encoding="utf-8") as f:
+        f.write("y = 1\n")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    after = test_generator.TestGenerator(source, {}).ast_tree
+
+    assert (assigned_name(before), assigned_name(after)) == ("x", "y")
+
+
+def test_parse_source_reports_success(make_source):
+    generator = test_generator.TestGenerator(make_source("a.py"), {})
+
+    assert generator.parse_source() is True
+    assert isinstance(generator.ast_tree, ast.Module)
+
+
+def test_parse_source_returns_false_on_syntax_error(make_source):
+    generator = test_generator.TestGenerator(make_source("bad.py", "def f(:\n"), {})
+
+    assert generator.parse_source() is False
+    with pytest.raises(SyntaxError):
+        generator.ast_tree
+
+
+def test_parse_source_returns_false_for_missing_file(tmp_path):
+    generator = test_generator.TestGenerator(str(tmp_path / "missing.py"), {})
+
+    assert generator.parse_source() is False
+    with pytest.raises(FileNotFoundError):
+        generator.ast_tree